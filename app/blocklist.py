@@ -0,0 +1,227 @@
+"""
+Disposable email domain blocklist.
+
+The blocklist is a compiled text file holding one domain per line with its
+labels reversed (`mailinator.com` -> `com.mailinator`), sorted bytewise.
+It is memory-mapped read-only and searched with a binary search, so every
+uvicorn worker shares the same page-cache copy instead of building its own
+Python set. An entry also blocks all of its subdomains.
+
+A background thread checks the file every `reload_interval` seconds and
+maps it again when it changes; the request path only reads the current
+snapshot. Update the file by replacing it atomically, as the `build`
+command below does (it writes a temporary file and renames it over the
+target), so lookups in flight keep using the previous mapping. Editing the
+file in place is not supported: the mapping is the file, and truncating it
+under a running worker crashes that worker.
+
+Compile a public list (one domain per line, `#` comments, optional `*.`
+wildcard prefixes) with:
+
+    python -m app.blocklist source.txt disposable.blocklist
+
+and point `DISPOSABLE_BLOCKLIST_FILE` at the result.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"# api-validator disposable blocklist v1\n"
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+
+def _reverse_domain(domain: str) -> str:
+    """Return `domain` with its labels in reverse order."""
+    return ".".join(reversed(domain.split(".")))
+
+
+def _normalize(domain: str) -> str:
+    """Lowercase and strip wildcard prefixes and surrounding dots."""
+    domain = domain.strip().lower()
+    if domain.startswith("*."):
+        domain = domain[2:]
+    return domain.strip(".")
+
+
+def _atomic_write(path: str, chunks: Sequence[bytes]) -> None:
+    """Write `chunks` to a temporary file and rename it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".blocklist-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _MappedBlocklist:
+    """A single immutable memory-mapped snapshot of the blocklist file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.signature: Tuple[int, int, int] = (
+                st.st_ino, st.st_mtime_ns, st.st_size
+            )
+            if st.st_size < len(HEADER):
+                raise ValueError(f"{path} is not a compiled blocklist")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(HEADER)] != HEADER:
+            self._map.close()
+            raise ValueError(
+                f"{path} is not a compiled blocklist; "
+                "build it with `python -m app.blocklist`"
+            )
+
+    def __contains__(self, key: bytes) -> bool:
+        data = self._map
+        lo, hi = len(HEADER), len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            newline = data.rfind(b"\n", lo, mid)
+            line_start = lo if newline < 0 else newline + 1
+            line_end = data.find(b"\n", line_start, hi)
+            if line_end < 0:
+                line_end = hi
+            line = data[line_start:line_end]
+            if line == key:
+                return True
+            if line < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return False
+
+
+class DomainBlocklist:
+    """Blocklist lookups with hot reload from a background thread."""
+
+    def __init__(self, path: str,
+                 reload_interval: float = DEFAULT_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[_MappedBlocklist] = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.reload()
+
+        if reload_interval > 0:
+            threading.Thread(
+                target=self._watch, name="blocklist-reload", daemon=True
+            ).start()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.reload()
+
+    def close(self) -> None:
+        """Stop the background reload thread."""
+        self._stop.set()
+
+    def reload(self) -> None:
+        """Swap in a new mapping if the file on disk has changed."""
+        with self._reload_lock:
+            try:
+                st = os.stat(self.path)
+                signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+                current = self._snapshot
+                if current is not None:
+                    if current.signature == signature:
+                        return
+                    if current.signature[0] == st.st_ino:
+                        logger.warning(
+                            f"Blocklist {self.path} was modified in place; "
+                            "replace it atomically (e.g. with "
+                            "`python -m app.blocklist`) to avoid crashing "
+                            "workers"
+                        )
+                self._snapshot = _MappedBlocklist(self.path)
+                logger.info(f"Loaded disposable domain blocklist: {self.path}")
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not load blocklist {self.path}: {e}")
+
+    def is_blocked(self, domain: str) -> bool:
+        """
+        Check whether `domain` or any of its parent domains is blocklisted.
+
+        Args:
+            domain: the domain part of an email address
+
+        Returns:
+            True if the domain is blocklisted, False otherwise (including
+            when no blocklist could be loaded).
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False
+
+        labels = _normalize(domain).split(".")
+        key = ""
+        for label in reversed(labels):
+            key = f"{key}.{label}" if key else label
+            # Skip the bare TLD; it is never a meaningful blocklist entry
+            if key != label and key.encode() in snapshot:
+                return True
+        return False
+
+
+def build_blocklist(domains: Iterable[str], path: str) -> int:
+    """
+    Compile `domains` into a blocklist file and atomically replace `path`.
+
+    Subdomains of other entries are dropped since the parent already
+    covers them.
+
+    Returns:
+        Number of entries written.
+    """
+    keys = set()
+    for line in domains:
+        line = line.split("#", 1)[0]
+        domain = _normalize(line)
+        if domain:
+            keys.add(_reverse_domain(domain))
+
+    def covered(key: str) -> bool:
+        parts = key.split(".")
+        return any(".".join(parts[:i]) in keys for i in range(2, len(parts)))
+
+    entries: List[bytes] = sorted(k.encode() for k in keys if not covered(k))
+    _atomic_write(path, [HEADER, b"\n".join(entries)])
+    return len(entries)
+
+
+@lru_cache(maxsize=1)
+def get_blocklist() -> Optional[DomainBlocklist]:
+    """Return the configured blocklist, or None when the check is disabled."""
+    path = os.getenv("DISPOSABLE_BLOCKLIST_FILE")
+    if not path:
+        return None
+    interval = float(
+        os.getenv("DISPOSABLE_BLOCKLIST_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL)
+    )
+    return DomainBlocklist(path, reload_interval=interval)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m app.blocklist SOURCE OUTPUT")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding="utf-8") as source:
+        count = build_blocklist(source, sys.argv[2])
+    print(f"Wrote {count} domains to {sys.argv[2]}")
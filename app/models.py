@@ -4,6 +4,8 @@ Pydantic models for user data validation.
 from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 
+from app.blocklist import get_blocklist
+
 
 class UsuarioValidation(BaseModel):
     """Model for personal data validation."""
@@ -22,6 +24,15 @@ class UsuarioValidation(BaseModel):
             raise ValueError('Must have at least 2 characters')
         return v.strip().capitalize()
 
+    @field_validator('email')
+    @classmethod
+    def validate_email_domain(cls, v: str) -> str:
+        """Reject disposable email providers when a blocklist is configured."""
+        blocklist = get_blocklist()
+        if blocklist is not None and blocklist.is_blocked(v.rpartition('@')[2]):
+            raise ValueError('Disposable email addresses are not allowed')
+        return v
+
     @field_validator('phone')
     @classmethod
     def validate_phone(cls, v: Optional[str]) -> Optional[str]:
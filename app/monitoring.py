@@ -0,0 +1,268 @@
+"""
+Event loop monitoring and on-demand profiling.
+
+`LoopLagMonitor` runs a watchdog thread that pings the event loop with
+`call_soon_threadsafe` every `interval` seconds and times each answer. A
+slow answer means the loop was busy running something else: either blocked
+by synchronous code or simply saturated with work. The answer times are the
+lag samples reported by `/health`. When an answer takes longer than the
+stall threshold, the watchdog logs a stack sample of the loop thread, which
+points at the blocking call, and logs the total duration once the loop
+recovers.
+
+`SamplingProfiler` samples the loop thread's stack from a background thread
+for a bounded number of seconds or requests and aggregates the hot paths.
+Samples taken while the loop waits for I/O are counted as idle and kept out
+of the rankings. Nothing runs while it is idle.
+"""
+
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(percent / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class LoopLagMonitor:
+    """Measure event loop lag and log stack samples of long stalls."""
+
+    def __init__(self, interval: float = 0.1, stall_threshold: float = 0.1,
+                 window: int = 1200):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.stalls = 0
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-stall-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the watchdog thread without blocking the loop."""
+        self._stop.set()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1)
+
+    def _watch(self) -> None:
+        # A new ping goes out `interval` after the previous answer, so any
+        # block longer than stall_threshold + interval is always caught.
+        while not self._stop.is_set():
+            answered = threading.Event()
+            sent = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # loop closed
+
+            if not answered.wait(self.stall_threshold):
+                self.stalls += 1
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame else ""
+                logger.warning(
+                    f"Event loop blocked for over "
+                    f"{self.stall_threshold * 1000:.0f} ms, "
+                    f"stack sample:\n{stack}"
+                )
+                while not answered.wait(self.interval):
+                    if self._stop.is_set():
+                        return
+                logger.warning(
+                    f"Event loop stall ended after "
+                    f"{(time.monotonic() - sent) * 1000:.0f} ms"
+                )
+
+            self._samples.append(time.monotonic() - sent)
+            self._stop.wait(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lag percentiles (in milliseconds) over the recent window."""
+        samples = sorted(self._samples)
+        return {
+            "lag_ms": {
+                "p50": round(_percentile(samples, 50) * 1000, 2),
+                "p95": round(_percentile(samples, 95) * 1000, 2),
+                "p99": round(_percentile(samples, 99) * 1000, 2),
+                "max": round((samples[-1] if samples else 0.0) * 1000, 2),
+            },
+            "samples": len(samples),
+            "stalls": self.stalls,
+        }
+
+
+class SamplingProfiler:
+    """Statistical profiler of the event loop thread, enabled on demand."""
+
+    def __init__(self, interval: float = 0.005, top: int = 20):
+        self.interval = interval
+        self.top = top
+        self.active = False
+        self._remaining_requests: Optional[int] = None
+        self._requests_seen = 0
+        self._done = threading.Event()
+
+    def request_finished(self) -> None:
+        """Count a finished request; called by `ProfilerRequestCounter`."""
+        self._requests_seen += 1
+        if self._remaining_requests is not None:
+            self._remaining_requests -= 1
+            if self._remaining_requests <= 0:
+                self._done.set()
+
+    async def profile(self, seconds: float,
+                      requests: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sample the event loop thread until `seconds` elapse or `requests`
+        requests have been handled, whichever comes first.
+
+        Returns:
+            Aggregated statistics of the functions seen most often.
+
+        Raises:
+            RuntimeError: if a profiling session is already running.
+        """
+        if self.active:
+            raise RuntimeError("A profiling session is already running")
+
+        self.active = True
+        self._remaining_requests = requests
+        self._requests_seen = 0
+        self._done.clear()
+
+        own_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        counts = {"samples": 0, "idle": 0}
+        loop_thread_id = threading.get_ident()
+        loop_entry = self._loop_entry_code()
+        deadline = time.monotonic() + seconds
+
+        def sample() -> None:
+            while not self._done.wait(self.interval):
+                if time.monotonic() >= deadline:
+                    break
+                frame = sys._current_frames().get(loop_thread_id)
+                if frame is None:
+                    continue
+                counts["samples"] += 1
+                if self._is_idle(frame, loop_entry):
+                    counts["idle"] += 1
+                    continue
+                own_samples[self._describe(frame)] += 1
+                seen = set()
+                while frame is not None:
+                    seen.add(self._describe(frame))
+                    frame = frame.f_back
+                total_samples.update(seen)
+
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(sample)
+        finally:
+            self.active = False
+
+        busy = counts["samples"] - counts["idle"]
+        return {
+            "duration_s": round(time.monotonic() - started, 3),
+            "requests": self._requests_seen,
+            "samples": counts["samples"],
+            "idle_percent": round(
+                counts["idle"] * 100 / (counts["samples"] or 1), 1
+            ),
+            "busy_samples": busy,
+            "top_self": self._rank(own_samples, busy or 1),
+            "top_total": self._rank(total_samples, busy or 1),
+        }
+
+    @staticmethod
+    def _loop_entry_code():
+        """
+        Return the code of the frame that entered the event loop.
+
+        With a loop implemented in C (uvloop) this frame is the top of the
+        stack while the loop waits for I/O. It is found by walking out of
+        the chain of coroutines awaiting the caller.
+        """
+        flags = (inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE
+                 | inspect.CO_ASYNC_GENERATOR)
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_flags & flags:
+            frame = frame.f_back
+        if frame is None:
+            return None
+        # The pure-Python loop runs callbacks from Handle._run instead
+        if frame.f_code.co_filename.endswith(("asyncio/events.py",
+                                               "asyncio\\events.py")):
+            return None
+        return frame.f_code
+
+    @staticmethod
+    def _is_idle(frame, loop_entry) -> bool:
+        """Whether the loop thread is waiting for I/O in this sample."""
+        code = frame.f_code
+        if code is loop_entry:
+            return True
+        return code.co_name == "select" and code.co_filename.endswith(
+            "selectors.py"
+        )
+
+    @staticmethod
+    def _describe(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+    def _rank(self, counter: Counter, total: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "function": function,
+                "samples": count,
+                "percent": round(count * 100 / total, 1),
+            }
+            for function, count in counter.most_common(self.top)
+        ]
+
+
+class ProfilerRequestCounter:
+    """
+    ASGI middleware counting finished requests to `path` for the profiler.
+
+    Every response is counted, including 422 errors produced while parsing
+    the body. When no profiling session is running it only checks a flag.
+    """
+
+    def __init__(self, app, profiler: SamplingProfiler, path: str = "/validate"):
+        self.app = app
+        self.profiler = profiler
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if (not self.profiler.active or scope["type"] != "http"
+                or scope["path"] != self.path):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.request_finished()
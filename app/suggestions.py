@@ -0,0 +1,292 @@
+"""
+Email domain typo suggestions.
+
+Known popular domains are loaded once into a SymSpell-style deletion
+index: every domain is stored under all the strings obtained by deleting
+up to `MAX_EDIT_DISTANCE` characters from its first label (`gmail` in
+`gmail.com`). A lookup generates the same deletes for the incoming domain
+and only compares against the handful of domains sharing one of them, so
+its cost does not grow with the list size.
+
+The first label and the rest of the domain are compared separately. Short
+labels allow fewer edits, since most short names are only a couple of edits
+away from each other, and a valid top-level domain is never rewritten into
+a different one, so `hotmail.fr` is left alone while `hotmail.con` becomes
+`hotmail.com`. The one exception is a valid TLD missing the last character
+of a known provider's TLD, such as `gmail.co` for `gmail.com`: that is far
+more often a truncated `.com` than a real domain.
+
+The list of domains can be overridden with the `EMAIL_SUGGESTION_DOMAINS`
+(comma-separated) or `EMAIL_SUGGESTION_DOMAINS_FILE` (one domain per line)
+environment variables.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_EDIT_DISTANCE = 2
+
+# Top-level domains that are never treated as typos, besides every
+# two-letter country code and the TLDs of the known domains.
+GENERIC_TLDS = frozenset({
+    "com", "net", "org", "edu", "gov", "mil", "int", "info", "biz",
+    "name", "pro", "mobi", "app", "dev", "email", "online", "xyz",
+})
+
+DEFAULT_POPULAR_DOMAINS = (
+    "gmail.com",
+    "yahoo.com",
+    "hotmail.com",
+    "outlook.com",
+    "icloud.com",
+    "aol.com",
+    "live.com",
+    "msn.com",
+    "me.com",
+    "mail.com",
+    "gmx.com",
+    "email.com",
+    "ymail.com",
+    "rocketmail.com",
+    "mac.com",
+    "aim.com",
+    "protonmail.com",
+    "proton.me",
+    "yandex.com",
+    "zoho.com",
+    "comcast.net",
+    "verizon.net",
+    "att.net",
+    "hotmail.es",
+    "yahoo.es",
+    "outlook.es",
+    "hotmail.fr",
+    "yahoo.fr",
+    "outlook.fr",
+    "live.fr",
+    "hotmail.de",
+    "yahoo.de",
+    "outlook.de",
+    "hotmail.it",
+    "yahoo.it",
+    "outlook.it",
+    "live.it",
+    "hotmail.co.uk",
+    "yahoo.co.uk",
+    "live.co.uk",
+    "googlemail.com",
+)
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Return every string obtained by deleting up to `max_distance` chars."""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between `a` and `b`.
+
+    Adjacent transpositions count as a single edit, so `gmial` is one edit
+    away from `gmail`. Returns `max_distance + 1` as soon as the distance is
+    known to exceed `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _allowed_distance(name: str, max_distance: int) -> int:
+    """Number of edits allowed for a first label of this length."""
+    if len(name) <= 3:
+        return 0
+    if len(name) < 6:
+        return min(1, max_distance)
+    return max_distance
+
+
+def _split(domain: str) -> Tuple[str, str]:
+    """Split a domain into its first label and the remaining suffix."""
+    name, _, suffix = domain.partition(".")
+    return name, suffix
+
+
+class DomainSuggester:
+    """Precomputed similarity index over a list of known email domains."""
+
+    def __init__(self, domains: Iterable[str],
+                 max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        self.domains: List[str] = []
+        self._known: Set[str] = set()
+        self._index: Dict[str, List[str]] = {}
+        self._valid_tlds: Set[str] = set(GENERIC_TLDS)
+
+        for domain in domains:
+            domain = domain.strip().lower()
+            if not domain or domain in self._known:
+                continue
+            self.domains.append(domain)
+            self._known.add(domain)
+            self._valid_tlds.add(domain.rpartition(".")[2])
+            for key in _deletes(_split(domain)[0], max_distance):
+                self._index.setdefault(key, []).append(domain)
+
+        self._max_length = max(
+            (len(_split(d)[0]) for d in self.domains), default=0
+        )
+        self._rank = {domain: i for i, domain in enumerate(self.domains)}
+
+    def _is_valid_tld(self, tld: str) -> bool:
+        return tld in self._valid_tlds or (len(tld) == 2 and tld.isalpha())
+
+    def suggest(self, domain: str) -> Optional[str]:
+        """
+        Return the closest known domain to `domain`, or None.
+
+        The first label may differ by up to `max_distance` edits (one edit
+        for labels shorter than six characters, none for three or fewer).
+        The rest of the domain must match exactly when its TLD is valid,
+        or be the candidate's suffix missing its last character (`co` for
+        `com`), and may be one edit away otherwise. No suggestion is made when
+        `domain` is already known. Ties are broken by list order, so more
+        popular domains should be listed first.
+        """
+        domain = domain.strip().lower()
+        if not domain or domain in self._known:
+            return None
+
+        name, suffix = _split(domain)
+        if len(name) > self._max_length + self.max_distance:
+            return None
+        allowed = _allowed_distance(name, self.max_distance)
+        suffix_is_valid = self._is_valid_tld(suffix.rpartition(".")[2])
+
+        candidates: Set[str] = set()
+        for key in _deletes(name, allowed):
+            candidates.update(self._index.get(key, ()))
+
+        best: Optional[str] = None
+        best_distance = allowed + 2
+        for candidate in sorted(candidates, key=self._rank.__getitem__):
+            candidate_name, candidate_suffix = _split(candidate)
+            if suffix_is_valid:
+                if candidate_suffix == suffix:
+                    suffix_distance = 0
+                elif candidate_suffix[:-1] == suffix:
+                    suffix_distance = 1
+                else:
+                    continue
+            else:
+                suffix_distance = _edit_distance(suffix, candidate_suffix, 1)
+                if suffix_distance > 1:
+                    continue
+            name_distance = _edit_distance(name, candidate_name, allowed)
+            if name_distance > allowed:
+                continue
+            if name_distance + suffix_distance < best_distance:
+                best = candidate
+                best_distance = name_distance + suffix_distance
+        return best
+
+
+def load_domains() -> List[str]:
+    """Load the popular domain list from the environment or the defaults."""
+    path = os.getenv("EMAIL_SUGGESTION_DOMAINS_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [line for line in f if line.strip() and not line.startswith("#")]
+
+    raw = os.getenv("EMAIL_SUGGESTION_DOMAINS")
+    if raw:
+        return raw.split(",")
+
+    return list(DEFAULT_POPULAR_DOMAINS)
+
+
+@lru_cache(maxsize=1)
+def get_suggester() -> DomainSuggester:
+    """Return the process-wide suggester, building the index on first use."""
+    return DomainSuggester(load_domains())
+
+
+@lru_cache(maxsize=4096)
+def suggest_domain(domain: str) -> Optional[str]:
+    """Cached lookup of a suggested replacement for an email domain."""
+    return get_suggester().suggest(domain)
+
+
+def suggest_email(email: str) -> Optional[str]:
+    """
+    Suggest a corrected email address when its domain looks like a typo.
+
+    Args:
+        email: an already syntactically valid email address
+
+    Returns:
+        The email with its domain replaced by the closest known domain, or
+        None when no correction is suggested.
+    """
+    local, _, domain = email.rpartition("@")
+    if not local:
+        return None
+    suggestion = suggest_domain(domain.lower())
+    if suggestion is None:
+        return None
+    return f"{local}@{suggestion}"
+
+
+if __name__ == "__main__":
+    # Batch benchmark: python -m app.suggestions [N]
+    import random
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(0)
+    suggester = get_suggester()
+    typos = ["gmial.com", "hotmail.con", "yaho.com", "outlok.com",
+             "icloud.co", "example.org", "gnail.com", "hotmial.com"]
+    words = [rng.choice(typos + suggester.domains) for _ in range(n)]
+
+    start = time.perf_counter()
+    for word in words:
+        suggester.suggest(word)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in words:
+        suggest_domain(word)
+    cached = time.perf_counter() - start
+
+    print(f"{n} lookups against {len(suggester.domains)} domains")
+    print(f"index:  {uncached / n * 1e6:.2f} us/lookup")
+    print(f"cached: {cached / n * 1e6:.2f} us/lookup")
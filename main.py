@@ -4,20 +4,28 @@ Personal Data Validator API using FastAPI.
 Endpoints:
     POST /validate - Validate personal data for a user
     GET / - API information
+    GET /health - Health status and event loop lag
+    POST /admin/profile - Sample the event loop (requires X-Admin-Token)
     GET /docs - Interactive Swagger UI
 """
 
+import asyncio
 import logging
 import json
+import os
+import secrets
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, Header, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from app.blocklist import get_blocklist
 from app.models import UsuarioValidation
+from app.monitoring import LoopLagMonitor, ProfilerRequestCounter, SamplingProfiler
+from app.suggestions import get_suggester, suggest_email
 
 # ==================== LOGGING CONFIGURATION ====================
 logging.basicConfig(
@@ -26,6 +34,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ==================== MONITORING ====================
+lag_monitor = LoopLagMonitor(
+    interval=float(os.getenv("LOOP_LAG_INTERVAL", "0.1")),
+    stall_threshold=float(os.getenv("LOOP_STALL_THRESHOLD", "0.1"))
+)
+profiler = SamplingProfiler()
+
 # ==================== GLOBAL ERROR HANDLER ====================
 def format_validation_errors(errors: list) -> Dict[str, str]:
     """Format Pydantic validation errors into a friendly dict."""
@@ -45,8 +60,12 @@ def format_validation_errors(errors: list) -> Dict[str, str]:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
+    get_suggester()
+    await asyncio.to_thread(get_blocklist)
+    lag_monitor.start()
     logger.info("Personal Data Validator API started")
     yield
+    await lag_monitor.stop()
     logger.info("Personal Data Validator API stopped")
 
 
@@ -61,6 +80,7 @@ app = FastAPI(
         "url": "http://localhost:8000"
     }
 )
+app.add_middleware(ProfilerRequestCounter, profiler=profiler)
 
 
 # ==================== ROUTES ====================
@@ -78,14 +98,58 @@ async def root() -> Dict[str, Any]:
 
 
 @app.get("/health", tags=["Health"])
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Dict[str, Any]:
     """
     Health check endpoint.
 
     Returns:
-        API health status
+        API health status and recent event loop lag percentiles
     """
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "event_loop": lag_monitor.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/admin/profile", tags=["Admin"])
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0, le=60),
+    requests: Optional[int] = Query(None, gt=0),
+    x_admin_token: Optional[str] = Header(None)
+) -> Dict[str, Any]:
+    """
+    Run the sampling profiler on the event loop and return hot-path stats.
+
+    Profiling stops after `seconds`, or earlier once `requests` calls to
+    /validate have been answered, including rejected ones. Samples taken
+    while the loop waits for I/O are reported as `idle_percent` and left
+    out of the rankings. Requires the `X-Admin-Token` header to
+    match the `ADMIN_TOKEN` environment variable.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    # Compare bytes: compare_digest rejects non-ASCII str. Header values
+    # arrive latin-1 decoded, so this recovers the bytes that were sent.
+    if not admin_token or not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode("latin-1"), admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "message": "Invalid or missing admin token",
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+    try:
+        stats = await profiler.profile(seconds, requests)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "timestamp": datetime.now().isoformat()}
+        )
+
+    return {**stats, "timestamp": datetime.now().isoformat()}
 
 
 @app.post("/validate", tags=["Validation"])
@@ -100,6 +164,10 @@ async def validate_user(usuario: UsuarioValidation) -> Dict[str, Any]:
     Optional fields:
         - phone (string, digits only, minimum 7 digits)
         - age (int, between 0 and 120)
+
+    The response includes a `suggestion` with a corrected email address
+    when the email domain looks like a typo of a popular domain
+    (e.g. `gmial.com` -> `gmail.com`), or null otherwise.
     """
     try:
         # Log the request
@@ -119,6 +187,7 @@ async def validate_user(usuario: UsuarioValidation) -> Dict[str, Any]:
                 "phone": usuario.phone,
                 "age": usuario.age
             },
+            "suggestion": suggest_email(usuario.email),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -47,6 +47,22 @@ def test_health_check():
     return response.status_code == 200
 
 
+def test_health_reports_event_loop_lag():
+    """Test the health check reports event loop lag."""
+    print(f"\n{YELLOW}Testing health check event loop lag...{RESET}")
+    response = requests.get(f"{BASE_URL}/health")
+    print_result("GET /health - Event loop lag", response)
+    return 'p99' in response.json().get('event_loop', {}).get('lag_ms', {})
+
+
+def test_admin_profile_requires_token():
+    """Test error: admin profiling without a token."""
+    print(f"\n{YELLOW}Testing error: admin profile without token...{RESET}")
+    response = requests.post(f"{BASE_URL}/admin/profile?seconds=1")
+    print_result("POST /admin/profile - Missing token", response)
+    return response.status_code == 403
+
+
 def test_successful_validation():
     """Test a successful validation."""
     print(f"\n{YELLOW}Testing successful validation...{RESET}")
@@ -202,6 +218,25 @@ def test_name_normalization():
     return False
 
 
+def test_email_domain_suggestion():
+    """Test email domain typo suggestion."""
+    print(f"\n{YELLOW}Testing email domain suggestion...{RESET}")
+
+    payload = {
+        "first_name": "juan",
+        "last_name": "perez",
+        "email": "juan.perez@gmial.com"
+    }
+
+    response = requests.post(f"{BASE_URL}/validate", json=payload)
+    print_result("POST /validate - Email domain suggestion", response)
+
+    if response.status_code == 200:
+        return response.json().get('suggestion') == "juan.perez@gmail.com"
+
+    return False
+
+
 def main():
     """Run all tests."""
     print(f"\n{BLUE}{'='*60}{RESET}")
@@ -228,6 +263,8 @@ def main():
     tests = [
         ("Root endpoint", test_endpoint_root),
         ("Health check", test_health_check),
+        ("Health check event loop lag", test_health_reports_event_loop_lag),
+        ("Error: Admin profile without token", test_admin_profile_requires_token),
         ("Successful validation", test_successful_validation),
         ("Validation without optional fields", test_validation_without_optional_fields),
         ("Error: Name too short", test_name_too_short),
@@ -237,6 +274,7 @@ def main():
         ("Error: Age out of range", test_age_out_of_range),
         ("Error: Missing required fields", test_missing_required_fields),
         ("Name normalization", test_name_normalization),
+        ("Email domain suggestion", test_email_domain_suggestion),
     ]
     
     resultados = []
@@ -0,0 +1,162 @@
+"""
+Unit tests for the disposable email domain blocklist.
+These run without the API server.
+"""
+
+import logging
+import os
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app.blocklist import HEADER, DomainBlocklist, build_blocklist, get_blocklist
+from app.models import UsuarioValidation
+
+SOURCE = [
+    "# disposable providers",
+    "mailinator.com",
+    "*.guerrillamail.com",
+    "sub.mailinator.com",
+    "yopmail.com  # trailing comment",
+    "10minutemail.com",
+    "",
+]
+
+
+@pytest.fixture
+def blocklist_path(tmp_path):
+    path = tmp_path / "disposable.blocklist"
+    build_blocklist(SOURCE, str(path))
+    return path
+
+
+@pytest.fixture
+def clear_blocklist_cache():
+    get_blocklist.cache_clear()
+    yield
+    get_blocklist.cache_clear()
+
+
+def test_build_writes_sorted_reversed_entries(blocklist_path):
+    assert blocklist_path.read_bytes() == HEADER + b"\n".join([
+        b"com.10minutemail",
+        b"com.guerrillamail",
+        b"com.mailinator",
+        b"com.yopmail",
+    ])
+
+
+def test_build_drops_entries_covered_by_a_parent(tmp_path):
+    path = tmp_path / "list"
+    count = build_blocklist(["a.example.com", "example.com", "b.c.example.com"], str(path))
+    assert count == 1
+
+
+def test_lookup_hit_and_miss(blocklist_path):
+    blocklist = DomainBlocklist(str(blocklist_path))
+    assert blocklist.is_blocked("mailinator.com")
+    assert blocklist.is_blocked("yopmail.com")
+    assert blocklist.is_blocked("10minutemail.com")
+    assert not blocklist.is_blocked("gmail.com")
+    assert not blocklist.is_blocked("xmailinator.com")
+    assert not blocklist.is_blocked("mailinator.co")
+
+
+def test_wildcard_and_subdomains_are_blocked(blocklist_path):
+    blocklist = DomainBlocklist(str(blocklist_path))
+    assert blocklist.is_blocked("guerrillamail.com")
+    assert blocklist.is_blocked("x.guerrillamail.com")
+    assert blocklist.is_blocked("a.b.mailinator.com")
+    assert blocklist.is_blocked("MAILINATOR.COM")
+
+
+def test_bare_tld_is_ignored(tmp_path):
+    path = tmp_path / "list"
+    build_blocklist(["com", "example.org"], str(path))
+    blocklist = DomainBlocklist(str(path))
+    assert not blocklist.is_blocked("gmail.com")
+    assert not blocklist.is_blocked("com")
+    assert blocklist.is_blocked("example.org")
+
+
+def test_header_only_file(tmp_path):
+    path = tmp_path / "list"
+    assert build_blocklist(["# nothing here"], str(path)) == 0
+    assert path.read_bytes() == HEADER
+    assert not DomainBlocklist(str(path)).is_blocked("mailinator.com")
+
+
+def test_uncompiled_or_missing_file_blocks_nothing(tmp_path):
+    raw = tmp_path / "raw.txt"
+    raw.write_text("mailinator.com\n")
+    assert not DomainBlocklist(str(raw)).is_blocked("mailinator.com")
+    assert not DomainBlocklist(str(tmp_path / "missing")).is_blocked("mailinator.com")
+
+
+def test_lookup_in_large_list(tmp_path):
+    domains = [f"d{i}.example{i % 7}.net" for i in range(5000)]
+    path = tmp_path / "list"
+    build_blocklist(domains, str(path))
+    blocklist = DomainBlocklist(str(path))
+    assert all(blocklist.is_blocked(d) for d in domains)
+    assert not any(blocklist.is_blocked(f"{d}x") for d in domains[:500])
+
+
+def test_reload_after_rebuild(blocklist_path):
+    blocklist = DomainBlocklist(str(blocklist_path), reload_interval=0)
+    assert blocklist.is_blocked("mailinator.com")
+
+    build_blocklist(["example.org"], str(blocklist_path))
+    # Lookups keep the current snapshot until a reload runs
+    assert blocklist.is_blocked("mailinator.com")
+
+    blocklist.reload()
+    assert blocklist.is_blocked("example.org")
+    assert not blocklist.is_blocked("mailinator.com")
+
+
+def test_background_thread_reloads(blocklist_path):
+    blocklist = DomainBlocklist(str(blocklist_path), reload_interval=0.01)
+    try:
+        build_blocklist(["example.org"], str(blocklist_path))
+        deadline = time.monotonic() + 2
+        while not blocklist.is_blocked("example.org"):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert not blocklist.is_blocked("mailinator.com")
+    finally:
+        blocklist.close()
+
+
+def test_failed_reload_keeps_previous_snapshot(blocklist_path):
+    blocklist = DomainBlocklist(str(blocklist_path), reload_interval=0)
+    os.replace(str(blocklist_path), str(blocklist_path) + ".old")
+    blocklist.reload()
+    assert blocklist.is_blocked("mailinator.com")
+
+
+def test_in_place_edit_is_reported(blocklist_path, caplog):
+    blocklist = DomainBlocklist(str(blocklist_path), reload_interval=0)
+    with open(blocklist_path, "ab") as f:
+        f.write(b"\norg.example")
+
+    with caplog.at_level(logging.WARNING, logger="app.blocklist"):
+        blocklist.reload()
+    assert "modified in place" in caplog.text
+
+
+def test_model_rejects_blocked_domain(blocklist_path, monkeypatch, clear_blocklist_cache):
+    monkeypatch.setenv("DISPOSABLE_BLOCKLIST_FILE", str(blocklist_path))
+
+    with pytest.raises(ValidationError, match="Disposable email addresses"):
+        UsuarioValidation(first_name="juan", last_name="perez", email="juan@mailinator.com")
+
+    usuario = UsuarioValidation(first_name="juan", last_name="perez", email="juan@gmail.com")
+    assert usuario.email == "juan@gmail.com"
+
+
+def test_model_skips_check_without_blocklist(monkeypatch, clear_blocklist_cache):
+    monkeypatch.delenv("DISPOSABLE_BLOCKLIST_FILE", raising=False)
+    usuario = UsuarioValidation(first_name="juan", last_name="perez", email="juan@mailinator.com")
+    assert usuario.email == "juan@mailinator.com"
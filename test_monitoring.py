@@ -0,0 +1,143 @@
+"""
+Unit tests for event loop monitoring and the admin profiling endpoint.
+These run without the API server.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.monitoring import LoopLagMonitor, SamplingProfiler
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+def spin(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def async_client():
+    transport = httpx.ASGITransport(app=main.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    return TestClient(main.app)
+
+
+def test_admin_profile_rejects_wrong_token(client):
+    response = client.post("/admin/profile?seconds=0.1", headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 403
+
+
+def test_admin_profile_rejects_non_ascii_token(client):
+    response = client.post(
+        "/admin/profile?seconds=0.1",
+        headers={"X-Admin-Token": "sécret".encode()},
+    )
+    assert response.status_code == 403
+
+
+def test_admin_profile_accepts_non_ascii_admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "sécret")
+    response = TestClient(main.app).post(
+        "/admin/profile?seconds=0.1",
+        headers={"X-Admin-Token": "sécret".encode()},
+    )
+    assert response.status_code == 200
+    assert "idle_percent" in response.json()
+
+
+def test_blocking_callback_counts_a_stall(caplog):
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01, stall_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_call(0.15)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor
+
+    with caplog.at_level(logging.WARNING, logger="app.monitoring"):
+        monitor = asyncio.run(run())
+
+    assert monitor.stalls == 1
+    assert "stack sample" in caplog.text
+    assert "blocking_call" in caplog.text
+    assert "stall ended after" in caplog.text
+    assert monitor.stats()["lag_ms"]["max"] >= 100
+
+
+def test_no_stall_while_loop_is_free():
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01, stall_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    stats = monitor.stats()
+    assert monitor.stalls == 0
+    assert stats["samples"] > 0
+    assert stats["lag_ms"]["p50"] < 50
+
+
+def test_request_limit_ends_session_early_with_rejected_requests():
+    async def run():
+        async with async_client() as client:
+            session = asyncio.create_task(main.profiler.profile(seconds=5, requests=3))
+            await asyncio.sleep(0.01)
+            codes = [
+                (await client.post("/validate", json={"first_name": "a"})).status_code
+                for _ in range(3)
+            ]
+            return codes, await session
+
+    codes, stats = asyncio.run(run())
+    assert codes == [422, 422, 422]
+    assert stats["requests"] == 3
+    assert stats["duration_s"] < 5
+
+
+def test_concurrent_session_gets_409(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    async def run():
+        async with async_client() as client:
+            session = asyncio.create_task(main.profiler.profile(seconds=0.3))
+            await asyncio.sleep(0.01)
+            response = await client.post(
+                "/admin/profile?seconds=0.1", headers={"X-Admin-Token": "secret"}
+            )
+            await session
+            return response
+
+    assert asyncio.run(run()).status_code == 409
+
+
+def test_idle_samples_stay_out_of_rankings():
+    async def run():
+        profiler = SamplingProfiler(interval=0.002)
+        session = asyncio.create_task(profiler.profile(seconds=0.4))
+        await asyncio.sleep(0.2)
+        spin(0.2)
+        return await session
+
+    stats = asyncio.run(run())
+    functions = [entry["function"] for entry in stats["top_self"]]
+    assert 20 < stats["idle_percent"] < 80
+    assert stats["busy_samples"] > 0
+    assert functions[0].startswith("spin ")
+    assert not any(function.startswith("select ") for function in functions)
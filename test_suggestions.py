@@ -0,0 +1,94 @@
+"""
+Unit tests for the email domain suggestion index.
+These run without the API server.
+"""
+
+import pytest
+
+from app.suggestions import (
+    DEFAULT_POPULAR_DOMAINS,
+    DomainSuggester,
+    _edit_distance,
+    suggest_email,
+)
+
+
+@pytest.fixture(scope="module")
+def suggester():
+    return DomainSuggester(DEFAULT_POPULAR_DOMAINS)
+
+
+def test_edit_distance_counts_transposition_as_one_edit():
+    assert _edit_distance("gmial", "gmail", 2) == 1
+    assert _edit_distance("hotmial", "hotmail", 2) == 1
+
+
+def test_edit_distance_basic_edits():
+    assert _edit_distance("gmail", "gmail", 2) == 0
+    assert _edit_distance("gmal", "gmail", 2) == 1
+    assert _edit_distance("gnail", "gmail", 2) == 1
+    assert _edit_distance("yahooo", "yahoo", 2) == 1
+
+
+def test_edit_distance_stops_above_max_distance():
+    assert _edit_distance("gmail", "protonmail", 2) == 3
+    assert _edit_distance("abcdef", "uvwxyz", 2) == 3
+
+
+@pytest.mark.parametrize("domain, expected", [
+    ("gmial.com", "gmail.com"),
+    ("gnail.com", "gmail.com"),
+    ("hotmial.com", "hotmail.com"),
+    ("hotmail.con", "hotmail.com"),
+    ("gmail.cmo", "gmail.com"),
+    ("yaho.com", "yahoo.com"),
+    ("outlok.com", "outlook.com"),
+    ("aol.con", "aol.com"),
+    ("hotmial.co.uk", "hotmail.co.uk"),
+    ("yahooo.fr", "yahoo.fr"),
+    ("gmail.co", "gmail.com"),
+    ("hotmail.co", "hotmail.com"),
+    ("icloud.co", "icloud.com"),
+    ("gmial.co", "gmail.com"),
+    ("GMIAL.COM", "gmail.com"),
+])
+def test_suggests_common_typos(suggester, domain, expected):
+    assert suggester.suggest(domain) == expected
+
+
+@pytest.mark.parametrize("domain", [
+    "mac.com", "ymail.com", "aim.com", "email.com", "acme.com", "hp.com",
+    "ge.com", "home.com", "att.com", "hotmail.fr", "hotmail.it",
+    "hotmail.de", "hotmail.pt", "yahoo.fr", "yahoo.de", "yahoo.it",
+    "outlook.fr", "yahoo.com.br", "example.org", "hotmail.co.uk",
+    "example.co",
+])
+def test_leaves_valid_domains_alone(suggester, domain):
+    assert suggester.suggest(domain) is None
+
+
+def test_known_domains_are_not_suggested(suggester):
+    for domain in DEFAULT_POPULAR_DOMAINS:
+        assert suggester.suggest(domain) is None
+
+
+def test_ties_are_resolved_by_list_order():
+    assert DomainSuggester(["gmail.com", "gmaik.com"]).suggest("gmaix.com") == "gmail.com"
+    assert DomainSuggester(["gmaik.com", "gmail.com"]).suggest("gmaix.com") == "gmaik.com"
+
+
+def test_over_length_and_empty_input(suggester):
+    assert suggester.suggest("g" * 200 + ".com") is None
+    assert suggester.suggest("") is None
+    assert suggester.suggest("gmailcom") is None
+
+
+def test_custom_domain_list():
+    suggester = DomainSuggester([" Example.COM ", "", "example.com"])
+    assert suggester.domains == ["example.com"]
+    assert suggester.suggest("exmaple.com") == "example.com"
+
+
+def test_suggest_email_keeps_local_part():
+    assert suggest_email("Juan.Perez@gmial.com") == "Juan.Perez@gmail.com"
+    assert suggest_email("juan@gmail.com") is None